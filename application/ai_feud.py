@@ -7,36 +7,63 @@ Date: 17/06/2022
 
 # JSON Module to load in cached values for the GUI to use.
 import json
+# OS and Sys used to make the backend package importable when this file is run directly.
+import os
+import sys
+# Struct to catch a truncated round pool.
+import struct
 # Random module to choose a random value out of the cached values.
 from random import randint
+# Time module to measure how long round transitions take.
+from time import perf_counter
 # Kivy App modules which are used for the application for the GUI.
 from kivy.app import App
+from kivy.clock import Clock
 from kivy.core.text import LabelBase
+from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
 from kivy.uix.screenmanager import ScreenManager, NoTransition, Screen
 from kivy.uix.textinput import TextInput
 
+# Add the project folder to the path so the backend package can be imported.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Import my event log class.
+from backend.event_log import EventLog
+# Import the shared round pool.
+from backend.round_pool import RoundPool, publish_pool
+
 # Custom Fonts being used by the project. Anton used for headings and NotoEmoji used for Emojis.
 LabelBase.register(name='Anton', fn_regular=r'../resources/Anton-Regular.ttf')
 LabelBase.register(name='Emoji_Font', fn_regular=r'../resources/NotoEmoji-VariableFont_wght.ttf')
 
 
-# Function which opens results file and gets the contents into a dictionary.
+# Function which maps the shared round pool, publishing it from the results file when needed.
 def get_results():
     """
-    A function which opens a file named results.json and returns the contents of the file as a dictionary.
+    A function which maps the round pool shared by every game process, publishing it from results.json first if the
+    pool is missing or older than the file.
     Returns
     -------
-    file_data: dict
-        A dictionary which contains all the cached values from the Cognitive Vision application.
+    RoundPool
+        A read-only view of all the cached values from the Cognitive Vision application.
     """
 
-    with open(r"resources/results.json", "r+") as file:
-        # Get dictionary.
-        file_data = json.load(file)["Results"]
-    # Return data.
-    return file_data
+    pointer_path = r"resources/results.pool"
+    results_path = r"resources/results.json"
+
+    # Publish a new pool if results.json has changed since the last one.
+    if not os.path.exists(pointer_path) or os.path.getmtime(results_path) > os.path.getmtime(pointer_path):
+        with open(results_path, "r") as file:
+            publish_pool(json.load(file)["Results"], pointer_path)
+
+    # Republish if the pool the pointer names is missing, empty or truncated rather than failing on every start.
+    try:
+        return RoundPool(pointer_path)
+    except (FileNotFoundError, ValueError, struct.error):
+        with open(results_path, "r") as file:
+            publish_pool(json.load(file)["Results"], pointer_path)
+        return RoundPool(pointer_path)
 
 
 # Main Application which implements the screen manager.
@@ -50,11 +77,15 @@ class AIFeud(App):
     ----------
     screen_manager: ScreenManager
         The screen manager is a Kivy Object which is used to control the navigation between screens.
+    event_log: EventLog
+        Records the guesses made during the game for later analysis.
 
     Methods
     -------
     build()
         A function belonging to Kivy which initializes the application with the screen manager and parameters necessary.
+    on_stop()
+        A function belonging to Kivy which is called when the application closes, it flushes the event log.
 
     """
 
@@ -70,15 +101,21 @@ class AIFeud(App):
 
         # Contains Game Data for the Program
         game_model = DataModel()
+        # Log of gameplay events which is written to disk in the background.
+        self.event_log = EventLog()
 
         # Create screen_manager and add widgets.
         screen_manager = ScreenManager(transition=NoTransition())
         screen_manager.add_widget(MainScreen(name="main"))
-        screen_manager.add_widget(GameScreen(game_model, name="game"))
+        screen_manager.add_widget(GameScreen(game_model, self.event_log, name="game"))
 
         # Return the screen_manager to start the application
         return screen_manager
 
+    def on_stop(self):
+        # Write any events still in memory before the application closes.
+        self.event_log.close()
+
 
 # Main DataModel of the application used by classes to manipulate the data.
 class DataModel:
@@ -90,8 +127,8 @@ class DataModel:
 
     Attributes
     ----------
-    self.results: dict
-        The return value of get_results() which reads in the contents of the file called results.json
+    self.results: RoundPool
+        The return value of get_results() which maps the pool of rounds shared by every game process
     choice: dict element
         The current chosen result from results to use in the game.
     lives: int
@@ -113,7 +150,7 @@ class DataModel:
 
     """
 
-    # Class variable which represents the contents of the results.json file.
+    # Class variable which represents the shared pool of rounds from the results.json file.
     results = get_results()
 
     def __init__(self):
@@ -136,6 +173,8 @@ class DataModel:
 
         """
 
+        # Switch to a newer pool if one has been published since the last round.
+        self.results.refresh()
         # Gets a random value between 0 and the number of items in the dictionary.
         random_value = randint(0, len(self.results) - 1)
         # Returns the random selection.
@@ -174,6 +213,7 @@ class DataModel:
         self.choice = self.choose_result()
         self.lives = 5
         self.image_url = self.choice['Url']
+        self.correct_guess_count = 0
 
 
 # Main Screen used for login
@@ -201,19 +241,39 @@ class GameScreen(Screen):
         ----------
         model: DataModel
             The data of the program which is used to change information on the view and control game logic.
+        event_log: EventLog
+            Records every guess, hit and miss along with round timings.
+        round_start: float
+            When the current round started, used to time guesses.
+        round_guesses: int
+            The number of guesses made in the current round.
         input_box: TextInput
             An input box widget used by the user to enter text.
+        controls: BoxLayout
+            Holds the input box during play and the buttons once the game ends.
+        buttons: BoxLayout
+            Holds the reset and quit buttons.
         btn_reset: Button
             Used to reset the game.
         btn_quit: Button
             Used to quit the game.
         labels: dict
             The UI labels which are manipulated when the user makes a correct guess
+        label_pool: list
+            Every answer label created so far, they are reused between rounds instead of being rebuilt.
 
         Methods
         -------
         add_input()
-            Adds a text input to the screen.
+            Adds the controls holding the text input and the buttons to the screen.
+        show_controls(playing)
+            Shows the text input during play and the buttons once the game ends.
+        on_enter()
+            Starts the first round when the screen is shown.
+        start_round()
+            Records the start of a round in the event log.
+        show_widget(widget, visible)
+            Shows or hides a widget which stays on the screen.
         set_lives()
             Updates the life counter on the screen.
         set_image_used()
@@ -226,20 +286,24 @@ class GameScreen(Screen):
             Called when the user enters in all their guesses.
         reset()
             Resets the game so the user can play again.
+        report_frame_time(start, dt)
+            Prints how long the round transition took once the next frame is drawn.
         quit()
             Ends the game when the user enters all correct guesses.
         """
 
-    def __init__(self, model, **kw):
+    def __init__(self, model, event_log, **kw):
         # Super constructor call
         super().__init__(**kw)
         # Data model which is referenced and manipulated by the program
         self.model = model
+        # Event log which records the guesses made by the user.
+        self.event_log = event_log
 
         # Input box which is loaded into UI.
         self.input_box = TextInput(hint_text='Enter Text',
                                    multiline=False,
-                                   size_hint=(0.75, 0.3),
+                                   size_hint=(0.75, 1),
                                    pos_hint={'center_x': 0.5, 'center_y': 0.5},
                                    font_size=20,
                                    on_text_validate=self.check
@@ -247,7 +311,6 @@ class GameScreen(Screen):
 
         # Reset button which is loaded into UI.
         self.btn_reset = Button(text='Reset',
-                                size_hint=(0.75, 0.25),
                                 pos_hint={'center_x': 0.5, 'center_y': 0.15},
                                 fontsize=40,
                                 font_name='DejaVuSans',
@@ -257,7 +320,6 @@ class GameScreen(Screen):
 
         # Quit button which is loaded into UI.
         self.btn_quit = Button(text='Quit',
-                               size_hint=(0.75, 0.25),
                                pos_hint={'center_x': 0.5, 'center_y': 0.15},
                                fontsize=40,
                                font_name='DejaVuSans',
@@ -265,19 +327,70 @@ class GameScreen(Screen):
                                background_color='#00E8FC'
                                )
 
-        # Add the input element to the UI.
+        # Bind the buttons once, binding them on every game over would stack duplicate handlers.
+        self.btn_reset.bind(on_press=self.reset)
+        self.btn_quit.bind(on_press=self.quit)
+
+        # Buttons are kept together so their spacing is only applied while they are shown.
+        self.buttons = BoxLayout(orientation='vertical',
+                                 spacing=10,
+                                 size_hint=(0.75, 1),
+                                 pos_hint={'center_x': 0.5}
+                                 )
+        self.buttons.add_widget(self.btn_reset)
+        self.buttons.add_widget(self.btn_quit)
+
+        # The controls have no spacing so whichever child is hidden takes up no room at all.
+        self.controls = BoxLayout(orientation='vertical')
+        self.controls.add_widget(self.input_box)
+        self.controls.add_widget(self.buttons)
+
+        # Add the controls to the UI, the buttons stay hidden until the game ends.
         self.add_input()
+        self.show_controls(True)
+
         # Set the lives on the screen.
         self.set_lives()
         # Set the image used on the screen.
         self.set_image_used()
-        # Create an empty dictionary.
+        # Create an empty dictionary and the pool of reusable labels.
         self.labels = {}
+        self.label_pool = []
         # Add labels to the display
         self.set_labels()
+        # The first round is timed from when the screen is entered, not while the user is on the main screen.
+        self.round_start = None
+        self.round_guesses = 0
 
     def add_input(self):
-        self.ids.main_box.add_widget(self.input_box)
+        self.ids.main_box.add_widget(self.controls)
+
+    def show_controls(self, playing):
+        # Size the controls as the input box (0.3) or the two buttons (0.25 each) were sized in the main box.
+        self.controls.size_hint_y = 0.3 if playing else 0.5
+        self.show_widget(self.input_box, playing)
+        self.show_widget(self.buttons, not playing)
+
+    def on_enter(self, *args):
+        # Start the first round the first time the game screen is shown.
+        if self.round_start is None:
+            self.start_round()
+
+    def start_round(self):
+        self.round_start = perf_counter()
+        self.round_guesses = 0
+        self.event_log.record("round_start", round=self.model.image_url, tags=self.model.choice['Contents'])
+
+    @staticmethod
+    def show_widget(widget, visible):
+        # Collapse hidden widgets so the layout gives their space to the others, keep the original size to restore it.
+        if not hasattr(widget, 'shown_size_hint'):
+            widget.shown_size_hint = widget.size_hint_y
+        widget.size_hint_y = widget.shown_size_hint if visible else None
+        if not visible:
+            widget.height = 0
+        widget.opacity = 1 if visible else 0
+        widget.disabled = not visible
 
     def set_lives(self):
         self.ids.life_counter.text = f"You have {self.model.lives} lives"
@@ -286,17 +399,25 @@ class GameScreen(Screen):
         self.ids.image_used.source = self.model.image_url
 
     def set_labels(self):
-        # Clear any widgets currently on the screen (used when the game is reset)
-        self.ids.answers.clear_widgets()
-
-        # Add labels to dictionary and then the screen.
-        for index, element in enumerate(self.model.choice['Contents']):
-            self.labels[element] = Label(text=str(index + 1),
-                                         font_name='DejaVuSans',
-                                         color='#00E8FC',
-                                         font_size=30
-                                         )
-            self.ids.answers.add_widget(self.labels[element])
+        contents = self.model.choice['Contents']
+
+        # Only create new labels when this round has more answers than any round before it.
+        while len(self.label_pool) < len(contents):
+            label = Label(font_name='DejaVuSans',
+                          color='#00E8FC',
+                          font_size=30
+                          )
+            self.label_pool.append(label)
+            self.ids.answers.add_widget(label)
+
+        # Reuse the pooled labels in place, blanking any which are not needed this round.
+        self.labels = {}
+        for index, label in enumerate(self.label_pool):
+            if index < len(contents):
+                label.text = str(index + 1)
+                self.labels[contents[index]] = label
+            else:
+                label.text = ''
 
         # Print the labels to the console.
         print(self.labels)
@@ -306,10 +427,13 @@ class GameScreen(Screen):
 
         # Get text from input box and sanitize.
         text = self.input_box.text.strip().lower()
+        self.round_guesses = self.round_guesses + 1
+        elapsed = round(perf_counter() - self.round_start, 3)
         # If the guess is correct.
         if self.model.check_guess(text):
             # Check if the label has already been set.
             if self.labels[text].text.lower() != text:
+                self.event_log.record("guess", round=self.model.image_url, guess=text, result="hit", elapsed=elapsed)
                 # Add text to UI.
                 self.labels[text].text = text.capitalize()
                 self.model.correct_guess_count = self.model.correct_guess_count + 1
@@ -319,11 +443,16 @@ class GameScreen(Screen):
             else:
                 # Check to see if the label has already been set. This is here to add score functionality in future
                 # update.
-                pass
+                self.event_log.record("guess", round=self.model.image_url, guess=text, result="repeat",
+                                      elapsed=elapsed)
                 print('Here')
 
         # If the guess is incorrect
         else:
+            # Record the tags still to be guessed so the miss is only counted against those.
+            remaining = [tag for tag, label in self.labels.items() if label.text.lower() != tag]
+            self.event_log.record("guess", round=self.model.image_url, guess=text, result="miss", elapsed=elapsed,
+                                  remaining=remaining)
             # Update lives on screen.
             self.set_lives()
 
@@ -334,48 +463,54 @@ class GameScreen(Screen):
         self.input_box.text = ''
 
     def end_game(self, text='Thank you for playing !'):
+        # Record how the round finished.
+        self.event_log.record("round_end",
+                              round=self.model.image_url,
+                              won=self.model.correct_guess_count == len(self.model.choice['Contents']),
+                              guesses=self.round_guesses,
+                              duration=round(perf_counter() - self.round_start, 3))
+
         # 1. Show all results to the user.
         for key in self.labels.keys():
             self.labels[key].text = key
 
-        # 2. Delete the text box.
-        self.ids.main_box.remove_widget(self.input_box)
-
-        # 3: Update Score Label
+        # 2: Update Score Label
         self.ids.life_counter.text = text
 
-        # 4. Add Button for restart
-        self.btn_reset.bind(on_press=self.reset)
-        self.ids.main_box.add_widget(self.btn_reset)
-
-        # 5. Add button to quit
-        self.btn_quit.bind(on_press=self.quit)
-        self.ids.main_box.add_widget(self.btn_quit)
+        # 3. Hide the text box and show the buttons for restart and quit in its place.
+        self.show_controls(False)
 
     def reset(self, event):
         print(f"Event Captured from button {event}")
-        # 1. Remove the buttons from the screen.
-        self.ids.main_box.remove_widget(self.btn_quit)
-        self.ids.main_box.remove_widget(self.btn_reset)
+        # Time the transition so stutter between rounds shows up in the console.
+        start = perf_counter()
 
-        # 2. Re-add the input box.
-        self.add_input()
+        # 1. Hide the buttons and show the input box again.
+        self.show_controls(True)
 
-        # 3. Set their lives back to 5
+        # 2. Set their lives back to 5
         self.model.lives = 5
 
-        # 4. Get a new choice from the dictionary
+        # 3. Get a new choice from the dictionary
         self.model.update_results()
 
-        # 5. Refresh UI elements on the screen.
+        # 4. Refresh UI elements on the screen.
         self.set_lives()
         self.set_image_used()
-        self.labels = {}
         self.set_labels()
+        self.start_round()
+
+        # 5. Report the frame time once the new round has been drawn.
+        Clock.schedule_once(lambda dt: self.report_frame_time(start, dt))
 
     @staticmethod
-    def quit(event):
+    def report_frame_time(start, dt):
+        print(f"Round transition took {(perf_counter() - start) * 1000:.1f} ms (frame time {dt * 1000:.1f} ms)")
+
+    def quit(self, event):
         print(f"Event Captured from button {event}")
+        # Write any buffered events, quit() exits before the application's on_stop is called.
+        self.event_log.close()
         # Exit the program
         quit()
 
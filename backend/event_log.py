@@ -0,0 +1,194 @@
+"""
+Purpose: To create a low overhead log of gameplay events which is flushed to disk in compressed batches.
+Author: Jack O'Shea
+Date: 19/10/2026
+
+"""
+
+# Gzip to compress each batch of events written to disk.
+import gzip
+# JSON module to write each event as a line of JSON.
+import json
+# OS used to create the log directory and name the log file.
+import os
+# Threading so flushing to disk happens off the UI thread.
+import threading
+# Time module to timestamp events.
+import time
+# Deque used as the in-memory ring buffer.
+from collections import deque
+
+
+class EventLog:
+    """
+    A class which is used to record gameplay events in a ring buffer and flush them to disk in the background.
+
+    ...
+
+    Attributes
+    ----------
+    path: str
+        The gzip compressed JSON lines file the events are written to.
+    batch_size: int
+        How many buffered events wake the flush thread early.
+    flush_interval: float
+        The longest time in seconds events wait in the buffer before being written.
+    dropped: int
+        The number of events which were lost because the buffer filled before a flush or the final write failed.
+
+    Methods
+    -------
+    record(event, **fields)
+        Adds an event to the buffer.
+    flush()
+        Writes every buffered event to disk as one compressed batch.
+    close()
+        Stops the flush thread and writes any remaining events.
+    """
+
+    def __init__(self, directory="logs", capacity=10000, batch_size=500, flush_interval=5.0):
+        """
+
+        Parameters
+        ----------
+        directory: str
+            The folder the log file is created in.
+        capacity: int
+            The most events held in memory, the oldest are dropped once it is full.
+        batch_size: int
+            How many buffered events wake the flush thread early.
+        flush_interval: float
+            The longest time in seconds events wait in the buffer before being written.
+        """
+
+        os.makedirs(directory, exist_ok=True)
+        # One file per session so several game processes never write to the same file.
+        self.path = os.path.join(directory, f"events-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.jsonl.gz")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+
+        # Ring buffer of events waiting to be written, the lock guards it and the dropped count.
+        self.__buffer = deque(maxlen=capacity)
+        self.__lock = threading.Lock()
+        # Serialises writes so a flush from close() never interleaves with the background thread.
+        self.__write_lock = threading.Lock()
+        self.__wake = threading.Event()
+        self.__closed = False
+
+        # Daemon thread so a forgotten close() never keeps the application alive.
+        self.__thread = threading.Thread(target=self.__run, name="EventLogFlush", daemon=True)
+        self.__thread.start()
+
+    def record(self, event, **fields):
+        """
+        Adds an event to the buffer, this only appends to memory so it is safe to call from the UI thread.
+
+        Parameters
+        ----------
+        event: str
+            The type of event, for example "guess" or "round_end".
+        fields
+            Any extra values to store with the event.
+
+        Returns
+        -------
+        No Return Value.
+        """
+
+        fields["event"] = event
+        fields["time"] = time.time()
+        with self.__lock:
+            if len(self.__buffer) == self.__buffer.maxlen:
+                self.dropped = self.dropped + 1
+            self.__buffer.append(fields)
+            full = len(self.__buffer) >= self.batch_size
+        # Wake the flush thread early rather than waiting for the interval.
+        if full:
+            self.__wake.set()
+
+    def flush(self):
+        """
+        Writes every buffered event to disk as one compressed batch, if the write fails the batch is put back so the
+        next flush retries it.
+
+        Raises
+        ------
+        OSError
+            Raised if the batch could not be written.
+
+        Returns
+        -------
+        No Return Value.
+        """
+
+        with self.__write_lock:
+            # Swap the buffer out while holding the lock so record() is only blocked for the swap.
+            with self.__lock:
+                if not self.__buffer:
+                    return
+                batch = list(self.__buffer)
+                self.__buffer.clear()
+
+            # Each batch is appended as its own gzip member, readers see one continuous stream.
+            lines = "".join(json.dumps(event, separators=(",", ":")) + "\n" for event in batch)
+            try:
+                with gzip.open(self.path, "at", encoding="utf-8") as file:
+                    file.write(lines)
+            except OSError:
+                # Put the batch back in front of any newer events, counting whatever no longer fits as dropped.
+                with self.__lock:
+                    events = batch + list(self.__buffer)
+                    overflow = max(0, len(events) - self.__buffer.maxlen)
+                    self.dropped = self.dropped + overflow
+                    self.__buffer.clear()
+                    self.__buffer.extend(events[overflow:])
+                raise
+
+    def close(self):
+        """
+        Stops the flush thread and writes any remaining events.
+
+        Returns
+        -------
+        No Return Value.
+        """
+
+        if self.__closed:
+            return
+        self.__closed = True
+        self.__wake.set()
+        self.__thread.join()
+
+        # A failed write here must not stop the application from closing, count the events as lost instead.
+        try:
+            self.flush()
+        except OSError as error:
+            with self.__lock:
+                self.dropped = self.dropped + len(self.__buffer)
+                self.__buffer.clear()
+            print(f"Could not write the event log: {error}")
+
+        if self.dropped:
+            print(f"The event log dropped {self.dropped} events")
+
+    def __run(self):
+        # Flush whenever the interval passes or the buffer reaches the batch size.
+        while not self.__closed:
+            self.__wake.wait(self.flush_interval)
+            self.__wake.clear()
+            try:
+                self.flush()
+            except OSError as error:
+                print(f"Could not write the event log: {error}")
+
+
+if __name__ == "__main__":
+    # Record a few events and check they were written.
+    log = EventLog()
+    log.record("round_start", round="https://picsum.photos/seed/example/200/300")
+    log.record("guess", round="https://picsum.photos/seed/example/200/300", guess="dog", result="miss")
+    log.close()
+
+    with gzip.open(log.path, "rt", encoding="utf-8") as log_file:
+        print(log_file.read())
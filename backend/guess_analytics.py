@@ -0,0 +1,159 @@
+"""
+Purpose: To aggregate gameplay event logs into common wrong guesses per tag and solve rates per round.
+Author: Jack O'Shea
+Date: 19/10/2026
+
+"""
+
+# Argparse to read the log files and options from the command line.
+import argparse
+# Gzip to read the compressed event logs.
+import gzip
+# JSON module to parse events and write the report.
+import json
+# OS used to find log files in a directory.
+import os
+# Zlib to catch corrupt compressed data in a damaged log.
+import zlib
+# Counter to count wrong guesses without keeping every event in memory.
+from collections import Counter, defaultdict
+
+
+def find_logs(paths):
+    """
+    Expands directories into the event log files they contain.
+
+    Parameters
+    ----------
+    paths: list
+        Log files or directories containing log files.
+
+    Returns
+    -------
+    A sorted list of log file paths.
+    """
+
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".jsonl.gz"))
+        else:
+            files.append(path)
+    return sorted(files)
+
+
+def read_events(files):
+    """
+    Streams events one at a time so millions of events never have to fit in memory.
+
+    Parameters
+    ----------
+    files: list
+        The gzip compressed JSON lines files to read.
+
+    Returns
+    -------
+    A generator of event dictionaries.
+    """
+
+    for path in files:
+        # A process killed mid flush leaves a truncated gzip member, keep the events before it and move on.
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                for line in file:
+                    # Skip a line which is not valid JSON rather than stopping the whole run.
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+        except (EOFError, gzip.BadGzipFile, zlib.error) as error:
+            print(f"Skipping the rest of damaged log {path}: {error}")
+
+
+def aggregate(events, top=10):
+    """
+    Counts the wrong guesses made against each tag and how often each round is solved.
+
+    Parameters
+    ----------
+    events
+        An iterable of event dictionaries as written by EventLog.
+    top: int
+        How many of the most common wrong guesses to keep per tag.
+
+    Returns
+    -------
+    report: dict
+        The wrong guesses per tag and the statistics for each round.
+    """
+
+    # The tags of each round, taken from its round_start event.
+    round_tags = {}
+    wrong_guesses = defaultdict(Counter)
+    rounds = defaultdict(lambda: {"played": 0, "solved": 0, "guesses": 0, "duration": 0.0})
+
+    for event in events:
+        kind = event.get("event")
+        round_id = event.get("round")
+
+        if kind == "round_start":
+            round_tags[round_id] = event.get("tags", [])
+        elif kind == "guess" and event.get("result") == "miss":
+            # A miss counts against the tags not yet guessed, the guesses which keep appearing are alias candidates.
+            for tag in event.get("remaining", round_tags.get(round_id, [])):
+                wrong_guesses[tag][event.get("guess", "")] += 1
+        elif kind == "round_end":
+            stats = rounds[round_id]
+            stats["played"] = stats["played"] + 1
+            stats["solved"] = stats["solved"] + (1 if event.get("won") else 0)
+            stats["guesses"] = stats["guesses"] + event.get("guesses", 0)
+            stats["duration"] = stats["duration"] + event.get("duration", 0.0)
+
+    # Turn the running totals into rates and averages.
+    report_rounds = {}
+    for round_id, stats in rounds.items():
+        solve_rate = stats["solved"] / stats["played"]
+        report_rounds[round_id] = {"played": stats["played"],
+                                   "solve_rate": round(solve_rate, 3),
+                                   "average_guesses": round(stats["guesses"] / stats["played"], 2),
+                                   "average_duration": round(stats["duration"] / stats["played"], 2),
+                                   "difficulty": difficulty(solve_rate)}
+
+    return {"wrong_guesses": {tag: counter.most_common(top) for tag, counter in sorted(wrong_guesses.items())},
+            "rounds": report_rounds}
+
+
+def difficulty(solve_rate):
+    """
+    Buckets a solve rate into a difficulty.
+
+    Parameters
+    ----------
+    solve_rate: float
+        The fraction of plays of a round which were won.
+
+    Returns
+    -------
+    "easy", "medium" or "hard".
+    """
+
+    if solve_rate >= 0.6:
+        return "easy"
+    elif solve_rate >= 0.25:
+        return "medium"
+    else:
+        return "hard"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aggregate AI Feud event logs.")
+    parser.add_argument("paths", nargs="*", default=["logs"], help="Event log files or directories.")
+    parser.add_argument("--top", type=int, default=10, help="Wrong guesses to keep per tag.")
+    parser.add_argument("--output", default="resources/guess_report.json", help="Where to write the report.")
+    args = parser.parse_args()
+
+    # Aggregate every log and save the report.
+    report = aggregate(read_events(find_logs(args.paths)), top=args.top)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=4)
+    print(f"Wrote {len(report['rounds'])} rounds and {len(report['wrong_guesses'])} tags to {args.output}")
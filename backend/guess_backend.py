@@ -34,6 +34,10 @@ class GuessBackend:
             The custom API interface class I created.
         current_image_url: str
             The randomly generated URL pointing to an image.
+        shard_index: int
+            The partition of the seed space this backend draws seeds from.
+        shard_count: int
+            How many partitions the seed space is split into across all harvesters.
 
         Methods
         -------
@@ -43,12 +47,23 @@ class GuessBackend:
             sets the value of the url.
         generate_url()
             generates a random url
+        seed_owner(seed, shard_count)
+            returns the shard which owns a seed.
         """
 
     # Characters to be used in the random string.
     characters = string.ascii_letters + string.digits
+    # Length of the random string and the number of different strings it can be.
+    seed_length = 25
+    seed_space = len(characters) ** seed_length
+
+    def __init__(self, shard_index=0, shard_count=1):
+        # Check the shard is one of the partitions, otherwise raise exception.
+        if not 0 <= shard_index < shard_count:
+            raise ValueError(f"Shard index {shard_index} is not between 0 and {shard_count - 1}")
+        self.shard_index = shard_index
+        self.shard_count = shard_count
 
-    def __init__(self):
         self.cv = CognitiveVision(key=os.getenv("SUBSCRIPTION_KEY"),
                                   endpoint=os.getenv("ENDPOINT"))
         self.current_image_url = self.generate_url()
@@ -82,19 +97,51 @@ class GuessBackend:
 
     def generate_url(self):
         """
-        Generates the url to a random image.
+        Generates the url to a random image, the seed always belongs to this backend's shard so separate harvesters
+        never generate the same seed.
 
         Returns
         -------
         Returns a dictionary containing an url which is a random string.
         """
 
-        # Makes a string 25 characters long of random characters.
-        generated_value = ''.join(random.choice(self.characters) for _ in range(25))
+        # Pick a random number and move it onto this shard's partition, numbers equal to shard_index mod shard_count.
+        number = random.randrange(self.seed_space)
+        number = number - number % self.shard_count + self.shard_index
+        if number >= self.seed_space:
+            number = number - self.shard_count
+
+        # Makes a string 25 characters long by writing the number in base 62.
+        generated_value = ''
+        for _ in range(self.seed_length):
+            number, digit = divmod(number, len(self.characters))
+            generated_value = self.characters[digit] + generated_value
 
         # Returns the Dictionary containing the URL.
         return {"url": f"https://picsum.photos/seed/{generated_value}picsum/200/300"}
 
+    @classmethod
+    def seed_owner(cls, seed, shard_count):
+        """
+        Works out which shard a seed generated by generate_url belongs to.
+
+        Parameters
+        ----------
+        seed
+            The 25 character random string from the url.
+        shard_count
+            How many partitions the seed space is split into.
+
+        Returns
+        -------
+        The index of the shard which owns the seed.
+        """
+
+        number = 0
+        for character in seed:
+            number = number * len(cls.characters) + cls.characters.index(character)
+        return number % shard_count
+
     def scan_image(self):
         """
         Scans the image at the currently stored url.
@@ -0,0 +1,211 @@
+"""
+Purpose: To harvest rounds in parallel across processes and machines and merge them into the results file.
+Author: Jack O'Shea
+Date: 19/10/2026
+
+"""
+
+# Argparse to read the harvest options from the command line.
+import argparse
+# JSON module to write shard files and the results file.
+import json
+# OS used to name shard files and replace the results file atomically.
+import os
+# Sys to exit with an error when a shard fails.
+import sys
+# Multiprocessing to run one harvester per shard on this machine.
+from multiprocessing import Process
+# Requests to catch failed calls to the API without stopping the shard.
+import requests
+# Import my guess backend class.
+from backend.guess_backend import GuessBackend
+# Import the shared round pool so games pick up merged rounds.
+from backend.round_pool import publish_pool
+
+
+def shard_path(directory, shard_index, shard_count):
+    """
+    Returns the file a shard writes its rounds to.
+
+    Parameters
+    ----------
+    directory: str
+        The folder holding the shard files.
+    shard_index: int
+        The partition of the seed space the shard owns.
+    shard_count: int
+        How many partitions the seed space is split into.
+
+    Returns
+    -------
+    The path of the shard file.
+    """
+
+    return os.path.join(directory, f"results-shard-{shard_index:04d}-of-{shard_count:04d}.jsonl")
+
+
+def harvest_shard(shard_index, shard_count, rounds, directory="shards"):
+    """
+    Scans random images from one partition of the seed space and appends each round to the shard's own file.
+
+    Parameters
+    ----------
+    shard_index: int
+        The partition of the seed space this harvester owns.
+    shard_count: int
+        How many partitions the seed space is split into across every process and machine.
+    rounds: int
+        How many images to scan.
+    directory: str
+        The folder holding the shard files.
+
+    Returns
+    -------
+    No Return Value.
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    gb = GuessBackend(shard_index, shard_count)
+
+    with open(shard_path(directory, shard_index, shard_count), "a") as file:
+        for _ in range(rounds):
+            gb.current_image_url = gb.generate_url()
+            # Skip images the API fails on, or returns no caption for, rather than losing the rest of the shard.
+            try:
+                tags, caption = gb.scan_image()
+            except (requests.RequestException, KeyError, IndexError) as error:
+                print(f"Shard {shard_index} could not scan {gb.current_image_url['url']}: {error}")
+                continue
+
+            contents = [tag['name'] for tag in tags]
+            main_dict = {"Url": gb.current_image_url["url"], "Caption": caption, "Contents": contents[0:6]}
+            # One line per round, flushed straight away so a crash only loses the round in progress.
+            file.write(json.dumps(main_dict) + "\n")
+            file.flush()
+
+
+def run_local(first_shard, workers, shard_count, rounds, directory="shards"):
+    """
+    Runs one harvesting process for each of this machine's shards and waits for them to finish.
+
+    Parameters
+    ----------
+    first_shard: int
+        The first shard owned by this machine, each machine takes a different range of shards.
+    workers: int
+        How many processes, and so shards, to run on this machine.
+    shard_count: int
+        How many shards there are across every machine.
+    rounds: int
+        How many images each process scans.
+    directory: str
+        The folder holding the shard files.
+
+    Raises
+    ------
+    ValueError
+        Raised if this machine's shards are not all between 0 and shard_count - 1.
+
+    Returns
+    -------
+    failed: list
+        The shards whose process exited with an error.
+    """
+
+    # Check the shards before starting anything, otherwise out of range processes fail one by one after starting.
+    if workers < 1 or first_shard < 0 or first_shard + workers > shard_count:
+        raise ValueError(f"Shards {first_shard} to {first_shard + workers - 1} are not between 0 and "
+                         f"{shard_count - 1}, check --first-shard, --workers and --shard-count")
+
+    processes = [Process(target=harvest_shard, args=(shard_index, shard_count, rounds, directory))
+                 for shard_index in range(first_shard, first_shard + workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    # A crashed process only prints its traceback, so collect the shards which did not finish cleanly.
+    return [shard_index for shard_index, process in zip(range(first_shard, first_shard + workers), processes)
+            if process.exitcode != 0]
+
+
+def merge_shards(directory="shards", results_path="resources/results.json", pointer_path="resources/results.pool"):
+    """
+    Combines every shard file into the results file, dropping rounds whose url or whose caption and contents are
+    already present, and publishes a new round pool.
+
+    Parameters
+    ----------
+    directory: str
+        The folder holding the shard files, copy the shards from other machines here first.
+    results_path: str
+        The main results file.
+    pointer_path: str
+        The pointer file of the shared round pool.
+
+    Returns
+    -------
+    added: int
+        The number of new rounds merged in.
+    """
+
+    with open(results_path, "r") as file:
+        file_data = json.load(file)
+    seen_urls = {result["Url"] for result in file_data["Results"]}
+    # Different seeds often resolve to the same picsum image, which shows up as a repeated caption and contents.
+    seen_rounds = {(result["Caption"], tuple(result["Contents"])) for result in file_data["Results"]}
+
+    added = 0
+    for name in sorted(os.listdir(directory)):
+        if not name.startswith("results-shard-") or not name.endswith(".jsonl"):
+            continue
+        with open(os.path.join(directory, name), "r") as file:
+            for line in file:
+                # Skip a partial last line left by a harvester which was killed mid write.
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                key = (result["Caption"], tuple(result["Contents"]))
+                if result["Url"] not in seen_urls and key not in seen_rounds:
+                    seen_urls.add(result["Url"])
+                    seen_rounds.add(key)
+                    file_data["Results"].append(result)
+                    added = added + 1
+
+    # Write to a temporary file first so the results file is never left half written.
+    temp_path = f"{results_path}.{os.getpid()}.tmp"
+    with open(temp_path, "w") as file:
+        json.dump(file_data, file, indent=4)
+    os.replace(temp_path, results_path)
+
+    publish_pool(file_data["Results"], pointer_path)
+    return added
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Harvest AI Feud rounds in shards and merge them.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Harvest this machine's shards.")
+    run_parser.add_argument("--first-shard", type=int, default=0, help="First shard owned by this machine.")
+    run_parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Processes to run on this machine.")
+    run_parser.add_argument("--shard-count", type=int, help="Shards across every machine, defaults to --workers.")
+    run_parser.add_argument("--rounds", type=int, default=10, help="Images to scan per process.")
+    run_parser.add_argument("--directory", default="shards", help="Folder for the shard files.")
+
+    merge_parser = commands.add_parser("merge", help="Merge shard files into the results file.")
+    merge_parser.add_argument("--directory", default="shards", help="Folder holding the shard files.")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        try:
+            failed = run_local(args.first_shard, args.workers, args.shard_count or args.workers, args.rounds,
+                               args.directory)
+        except ValueError as error:
+            parser.error(str(error))
+        if failed:
+            print(f"Shards {', '.join(str(shard) for shard in failed)} failed, check the errors above")
+            sys.exit(1)
+    else:
+        print(f"Merged {merge_shards(args.directory)} new rounds")
@@ -0,0 +1,229 @@
+"""
+Purpose: To share the cached rounds between game processes through a read-only memory mapped file.
+Author: Jack O'Shea
+Date: 19/10/2026
+
+"""
+
+# JSON module to read the rounds from results.json.
+import json
+# Mmap so every process maps the same pages of the pool instead of holding its own copy.
+import mmap
+# OS used to publish pools atomically and clean up old ones.
+import os
+# Struct to pack the rounds into a compact binary layout.
+import struct
+# Time module to name each published pool.
+import time
+
+# Pool layout: header, a table of record offsets and then the records. Strings are length prefixed UTF-8.
+MAGIC = b"AIFP"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")
+OFFSET = struct.Struct("<I")
+LENGTH = struct.Struct("<H")
+COUNT = struct.Struct("<B")
+# Seconds an old pool is kept after being replaced, so a process which has just read the pointer can still map it. A
+# pool's modified time is set when the pointer moves off it, and for a pool never pointed to it is its creation.
+GRACE_PERIOD = 60
+
+
+def pack_string(value):
+    data = value.encode("utf-8")
+    return LENGTH.pack(len(data)) + data
+
+
+def publish_pool(results, pointer_path="resources/results.pool"):
+    """
+    Writes the rounds to a new pool file and then atomically points the pointer file at it.
+
+    Parameters
+    ----------
+    results: list
+        The rounds to publish, each a dictionary with a Url, Caption and Contents.
+    pointer_path: str
+        The small file which names the current pool, processes read it to find the pool to map.
+
+    Returns
+    -------
+    path: str
+        The path of the pool file which was published.
+    """
+
+    # Pack every record and work out where each one starts.
+    records = []
+    for result in results:
+        records.append(pack_string(result["Url"]) + pack_string(result["Caption"]) +
+                       COUNT.pack(len(result["Contents"])) +
+                       b"".join(pack_string(tag) for tag in result["Contents"]))
+
+    offsets = []
+    position = HEADER.size + OFFSET.size * len(records)
+    for record in records:
+        offsets.append(position)
+        position = position + len(record)
+
+    # Every publish writes a new file, a pool which is mapped by a running process is never modified.
+    directory = os.path.dirname(pointer_path) or "."
+    name = f"{os.path.basename(pointer_path)}.{time.time_ns()}-{os.getpid()}.bin"
+    path = os.path.join(directory, name)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(records)))
+        file.write(b"".join(OFFSET.pack(offset) for offset in offsets))
+        file.write(b"".join(records))
+        # Make sure the pool is on disk before the pointer names it, so a crash never leaves it pointing at a partial
+        # pool.
+        file.flush()
+        os.fsync(file.fileno())
+
+    # Remember the pool being replaced so its grace period can start from now.
+    try:
+        with open(pointer_path, "r") as file:
+            previous = file.read().strip()
+    except FileNotFoundError:
+        previous = None
+
+    # Swap the pointer with a rename so readers see either the old pool or the new one, never half of one.
+    temp_pointer = f"{pointer_path}.{os.getpid()}.tmp"
+    with open(temp_pointer, "w") as file:
+        file.write(name)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_pointer, pointer_path)
+
+    # Mark when the previous pool was replaced.
+    if previous:
+        try:
+            os.utime(os.path.join(directory, previous))
+        except OSError:
+            pass
+
+    # Another process may have published at the same time, so never remove whichever pool the pointer names now.
+    with open(pointer_path, "r") as file:
+        current = file.read().strip()
+
+    # Remove older pools once they are past the grace period, any still mapped by a process (on Windows) are left for
+    # the next publish.
+    prefix = os.path.basename(pointer_path) + "."
+    for old in os.listdir(directory):
+        if old.startswith(prefix) and old.endswith(".bin") and old not in (name, current):
+            old_path = os.path.join(directory, old)
+            try:
+                if time.time() - os.path.getmtime(old_path) > GRACE_PERIOD:
+                    os.remove(old_path)
+            except OSError:
+                pass
+
+    return path
+
+
+class RoundPool:
+    """
+    A class which is used to read rounds from a published pool without copying the whole pool into the process.
+
+    ...
+
+    Attributes
+    ----------
+    pointer_path: str
+        The file which names the current pool.
+
+    Methods
+    -------
+    refresh()
+        Maps the newest pool if a newer one has been published.
+    __len__()
+        Returns the number of rounds in the pool.
+    __getitem__(index)
+        Decodes a single round into a dictionary.
+    """
+
+    def __init__(self, pointer_path="resources/results.pool"):
+        """
+
+        Parameters
+        ----------
+        pointer_path: str
+            The file which names the current pool.
+        """
+
+        self.pointer_path = pointer_path
+        self.__name = None
+        self.__map = None
+        self.__count = 0
+        self.refresh()
+
+    def refresh(self):
+        """
+        Maps the newest pool if a newer one has been published, this is cheap enough to call every round.
+
+        Returns
+        -------
+        True or False
+            Whether a new pool was mapped.
+        """
+
+        # Retry once if the pool is replaced and removed between reading the pointer and opening the pool.
+        for attempt in range(2):
+            with open(self.pointer_path, "r") as file:
+                name = file.read().strip()
+            if name == self.__name:
+                return False
+
+            path = os.path.join(os.path.dirname(self.pointer_path) or ".", name)
+            try:
+                with open(path, "rb") as file:
+                    pool_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                break
+            except FileNotFoundError:
+                if attempt == 1:
+                    raise
+
+        magic, version, count = HEADER.unpack_from(pool_map, 0)
+        if magic != MAGIC or version != VERSION:
+            pool_map.close()
+            raise ValueError(f"{path} is not a version {VERSION} round pool")
+
+        # Rounds already handed out are plain dictionaries so closing the old map is safe.
+        if self.__map is not None:
+            self.__map.close()
+        self.__name = name
+        self.__map = pool_map
+        self.__count = count
+        return True
+
+    def __len__(self):
+        return self.__count
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.__count:
+            raise IndexError("round pool index out of range")
+
+        # Find the record and read its fields in the order they were packed.
+        position = OFFSET.unpack_from(self.__map, HEADER.size + OFFSET.size * index)[0]
+        url, position = self.__read_string(position)
+        caption, position = self.__read_string(position)
+        count = COUNT.unpack_from(self.__map, position)[0]
+        position = position + COUNT.size
+
+        contents = []
+        for _ in range(count):
+            tag, position = self.__read_string(position)
+            contents.append(tag)
+
+        return {"Url": url, "Caption": caption, "Contents": contents}
+
+    def __read_string(self, position):
+        length = LENGTH.unpack_from(self.__map, position)[0]
+        start = position + LENGTH.size
+        return self.__map[start:start + length].decode("utf-8"), start + length
+
+
+if __name__ == "__main__":
+    # Publish the cached results so game processes can map them.
+    with open("resources/results.json", "r") as results_file:
+        pool_path = publish_pool(json.load(results_file)["Results"])
+
+    pool = RoundPool()
+    print(f"Published {len(pool)} rounds to {pool_path}")
+    print(pool[0])